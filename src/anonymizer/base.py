@@ -1,35 +1,55 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Pattern, Tuple
 from dataclasses import dataclass
 
-@dataclass
+from .utils.metrics import score_labels
+
+@dataclass(frozen=True)
+class Entity:
+    """A span of the original text that was masked"""
+    start: int
+    end: int
+    label: str
+
+@dataclass(frozen=True)
 class AnonymizationResult:
     """Data class to hold anonymization results"""
     text: str
-    entities: List[Dict[str, Any]]
+    entities: Tuple[Entity, ...]
 
 class BaseAnonymizer(ABC):
     """Abstract base class for text anonymizers"""
     
+    # Label token pattern the evaluation compares texts by, set per subclass
+    label_pattern: Pattern[str]
+    
     @abstractmethod
     def anonymize_text(self, text: str) -> AnonymizationResult:
         """Anonymize the given text and return the result"""
         pass
     
-    @abstractmethod
-    def evaluate_anonymization(self, raw_text: str, labeled_text: str) -> Dict[str, float]:
+    def anonymize_batch(self, texts: List[str]) -> List[AnonymizationResult]:
+        """Anonymize several texts; override to process them as one batch"""
+        return [self.anonymize_text(text) for text in texts]
+    
+    def evaluate_anonymization(self, raw_text: str, labeled_text: str) -> Dict[str, Any]:
         """Evaluate anonymization against labeled text"""
-        pass
+        anonymized = self.anonymize_text(raw_text).text
+        metrics = score_labels(self.label_pattern, [labeled_text], [anonymized])
+        return {**metrics, "anonymized": anonymized}
     
     @abstractmethod
     def generate_test_data(self, num_samples: int = 5) -> List[tuple]:
         """Generate test data for evaluation"""
         pass
     
-    @abstractmethod
-    def evaluate_test_cases(self, test_cases: List[tuple]) -> Dict[str, float]:
+    def evaluate_test_cases(self, test_cases: List[tuple]) -> Dict[str, Any]:
         """Evaluate a set of test cases"""
-        pass
+        results = self.anonymize_batch([raw for raw, _ in test_cases])
+        anonymized = [result.text for result in results]
+        expected = [labeled for _, labeled in test_cases]
+        metrics = score_labels(self.label_pattern, expected, anonymized)
+        return {**metrics, "anonymized": anonymized}
     
     def get_name(self) -> str:
         """Get the name of the anonymizer implementation"""
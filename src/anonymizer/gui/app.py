@@ -1,19 +1,50 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import logging
-from typing import Dict, Any
-
-from ..regex import RegexAnonymizer
-from ..presidio import PresidioAnonymizer
-from ..base import BaseAnonymizer
-
-# Set up logging
+import logging.handlers
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..base import AnonymizationResult, BaseAnonymizer
+
+# Set up logging; records go through a queue so the Tk thread never
+# waits on file I/O, and a listener thread writes them to disk
+_log_queue = queue.SimpleQueue()
+_file_handler = logging.FileHandler("anonymizer.log")
+_file_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+)
+_log_listener = logging.handlers.QueueListener(_log_queue, _file_handler)
 logging.basicConfig(
-    filename="anonymizer.log",
     level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
 
+# Exercises NER and the pattern recognizers of every anonymizer
+_WARM_UP_TEXT = "Warm-up text where John Smith from Boston gives 555-123-4567."
+
+
+# The anonymizer modules pull in spaCy, Presidio and Faker, so they are only
+# imported off the Tk thread, when an anonymizer is first needed
+def _create_regex_anonymizer() -> BaseAnonymizer:
+    from ..regex import RegexAnonymizer
+
+    return RegexAnonymizer()
+
+
+def _create_presidio_anonymizer() -> BaseAnonymizer:
+    from ..presidio import PresidioAnonymizer
+
+    return PresidioAnonymizer()
+
+
+_ANONYMIZER_FACTORIES: Dict[str, Callable[[], BaseAnonymizer]] = {
+    "Regex + NLP": _create_regex_anonymizer,
+    "Presidio": _create_presidio_anonymizer,
+}
+
 
 class AnonymizerGUI:
     def __init__(self):
@@ -21,12 +52,21 @@ class AnonymizerGUI:
         self.root.title("PII Anonymizer")
         self.root.configure(background="#f0f0f0")
 
-        # Initialize anonymizers
-        self.anonymizers = {
-            "Regex + NLP": RegexAnonymizer(),
-            "Presidio": PresidioAnonymizer(),
-        }
-        self.current_anonymizer = None
+        # Anonymizers are created on first use, see _get_anonymizer
+        self.anonymizers: Dict[str, Optional[BaseAnonymizer]] = dict.fromkeys(
+            _ANONYMIZER_FACTORIES
+        )
+        self.warm_up_error: Optional[Exception] = None
+
+        # Set once the warm-up thread is done with the models, or when the
+        # window closes; worker tasks wait for it, so the two threads never
+        # run the shared spaCy pipeline and Presidio analyzer at once
+        self._warm_up_done = threading.Event()
+        self._closing = False
+        self.current_anonymizer_name = None
+
+        # Anonymizer calls run here so NER never blocks the Tk event loop
+        self.executor = ThreadPoolExecutor(max_workers=1)
 
         # Set window size and position
         window_width = 1000
@@ -209,8 +249,15 @@ class AnonymizerGUI:
     def _on_anonymizer_change(self):
         """Handle anonymizer selection change"""
         selection = self.anonymizer_var.get()
-        self.current_anonymizer = self.anonymizers[selection]
-        logging.info(f"Switched to {selection} anonymizer")
+        self.current_anonymizer_name = selection
+        logging.info("Switched to %s anonymizer", selection)
+
+    def _get_anonymizer(self, name: str) -> BaseAnonymizer:
+        """Return the named anonymizer, creating it on first use"""
+        anonymizer = self.anonymizers[name]
+        if anonymizer is None:
+            anonymizer = self.anonymizers[name] = _ANONYMIZER_FACTORIES[name]()
+        return anonymizer
 
     def _anonymize_with_loading(self):
         """Anonymize text with loading state"""
@@ -219,15 +266,11 @@ class AnonymizerGUI:
             messagebox.showwarning("Warning", "Please enter text to anonymize.")
             return
 
-        self._set_loading_state(True)
-        try:
-            result = self.current_anonymizer.anonymize_text(text)
-            self.result_box_anonymize.delete("1.0", tk.END)
-            self.result_box_anonymize.insert(tk.END, result.text)
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        finally:
-            self._set_loading_state(False)
+        name = self.current_anonymizer_name
+        self._run_in_background(
+            lambda: self._get_anonymizer(name).anonymize_text(text),
+            self._display_anonymized,
+        )
 
     def _evaluate_with_loading(self):
         """Evaluate anonymization with loading state"""
@@ -237,26 +280,55 @@ class AnonymizerGUI:
             messagebox.showwarning("Warning", "Please enter both raw and labeled text.")
             return
 
-        self._set_loading_state(True)
-        try:
-            metrics = self.current_anonymizer.evaluate_anonymization(raw, labeled)
-            self._display_evaluation_results(metrics)
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        finally:
-            self._set_loading_state(False)
+        name = self.current_anonymizer_name
+        self._run_in_background(
+            lambda: self._get_anonymizer(name).evaluate_anonymization(raw, labeled),
+            self._display_evaluation_results,
+        )
 
     def _run_test_cases_with_loading(self):
         """Run test cases with loading state"""
+        name = self.current_anonymizer_name
+
+        def run_test_cases():
+            anonymizer = self._get_anonymizer(name)
+            test_cases = anonymizer.generate_test_data(5)
+            return test_cases, anonymizer.evaluate_test_cases(test_cases)
+
+        self._run_in_background(
+            run_test_cases, lambda result: self._display_test_results(*result)
+        )
+
+    def _run_in_background(self, task: Callable[[], Any], on_done: Callable):
+        """Run a task on the worker thread and hand its result back to Tk"""
         self._set_loading_state(True)
+        self._poll_future(
+            self.executor.submit(self._after_warm_up, task),
+            lambda future: self._show_result(future, on_done),
+        )
+
+    def _after_warm_up(self, task: Callable[[], Any]) -> Any:
+        """Run a task on the worker thread once the warm-up has finished"""
+        self._warm_up_done.wait()
+        if self._closing:
+            # The window was closed during the warm-up, so skip the work
+            return None
+        return task()
+
+    def _poll_future(self, future: Future, on_done: Callable[[Future], None]):
+        """Wait for a background task without blocking the event loop"""
+        if future.done():
+            on_done(future)
+        else:
+            self.root.after(50, self._poll_future, future, on_done)
+
+    def _show_result(self, future: Future, on_done: Callable):
+        """Leave the loading state and display a finished task's result"""
+        self._set_loading_state(False)
         try:
-            test_cases = self.current_anonymizer.generate_test_data(5)
-            metrics = self.current_anonymizer.evaluate_test_cases(test_cases)
-            self._display_test_results(test_cases, metrics)
+            on_done(future.result())
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        finally:
-            self._set_loading_state(False)
 
     def _set_loading_state(self, is_loading: bool):
         """Set loading state for buttons and cursor"""
@@ -267,41 +339,92 @@ class AnonymizerGUI:
         self.eval_btn.configure(state=state)
         self.test_btn.configure(state=state)
         self.root.config(cursor=cursor)
-        self.root.update()
+
+    @staticmethod
+    def _set_text(widget: scrolledtext.ScrolledText, text: str):
+        """Replace the contents of a text widget with a single insert"""
+        widget.delete("1.0", tk.END)
+        widget.insert(tk.END, text)
+
+    def _display_anonymized(self, result: AnonymizationResult):
+        """Display the anonymized text in the anonymize tab"""
+        self._set_text(self.result_box_anonymize, result.text)
 
     def _display_evaluation_results(self, metrics: Dict[str, Any]):
         """Display evaluation results in the evaluation tab"""
-        self.result_box_eval.delete("1.0", tk.END)
-        self.result_box_eval.insert(
-            tk.END, f"Anonymized Text:\n{metrics['anonymized']}\n\n"
-        )
-        self.result_box_eval.insert(tk.END, "Metrics:\n")
-        self.result_box_eval.insert(
-            tk.END, f"📊 Precision: {metrics['Precision']:.2f}\n"
+        self._set_text(
+            self.result_box_eval,
+            f"Anonymized Text:\n{metrics['anonymized']}\n\n"
+            "Metrics:\n"
+            f"📊 Precision: {metrics['Precision']:.2f}\n"
+            f"📊 Recall: {metrics['Recall']:.2f}\n"
+            f"📊 F1-score: {metrics['F1-score']:.2f}\n",
         )
-        self.result_box_eval.insert(tk.END, f"📊 Recall: {metrics['Recall']:.2f}\n")
-        self.result_box_eval.insert(tk.END, f"📊 F1-score: {metrics['F1-score']:.2f}\n")
 
-    def _display_test_results(self, test_cases: list, metrics: Dict[str, float]):
+    def _display_test_results(self, test_cases: list, metrics: Dict[str, Any]):
         """Display test results in the test cases tab"""
-        self.result_box_test.delete("1.0", tk.END)
-        self.result_box_test.insert(tk.END, "🔍 Synthetic Test Cases Evaluation:\n")
+        parts = ["🔍 Synthetic Test Cases Evaluation:\n"]
+        cases = zip(test_cases, metrics["anonymized"])
+        for i, ((raw, expected), anonymized) in enumerate(cases, start=1):
+            parts.append(
+                f"\n📝 Test Case {i}:\n"
+                f"Raw: {raw}\n"
+                f"Expected: {expected}\n"
+                f"Anonymized: {anonymized}\n"
+            )
+        parts.append(
+            "\n📊 Overall Metrics:\n"
+            f"Precision: {metrics['Precision']:.2f}\n"
+            f"Recall: {metrics['Recall']:.2f}\n"
+            f"F1-score: {metrics['F1-score']:.2f}\n"
+        )
+        self._set_text(self.result_box_test, "".join(parts))
+
+    def _start_warm_up(self):
+        """Load the models on a daemon thread ahead of the first request"""
+        # Unlike the executor's worker, a daemon thread does not keep the
+        # process alive when the window is closed during the model load
+        self.status_bar.configure(text="Loading models…")
+        thread = threading.Thread(target=self._warm_up, daemon=True)
+        thread.start()
+        self._poll_warm_up(thread)
+
+    def _warm_up(self):
+        """Load and exercise the models behind every anonymizer"""
+        try:
+            from ..utils.nlp import warm_up_gpu
 
-        for i, (raw, expected) in enumerate(test_cases, start=1):
-            result = self.current_anonymizer.anonymize_text(raw)
-            self.result_box_test.insert(tk.END, f"\n📝 Test Case {i}:\n")
-            self.result_box_test.insert(tk.END, f"Raw: {raw}\n")
-            self.result_box_test.insert(tk.END, f"Expected: {expected}\n")
-            self.result_box_test.insert(tk.END, f"Anonymized: {result.text}\n")
+            warm_up_gpu()
+            for name in self.anonymizers:
+                self._get_anonymizer(name).anonymize_text(_WARM_UP_TEXT)
+        except Exception as e:
+            logging.error("Model warm-up failed", exc_info=e)
+            self.warm_up_error = e
+        finally:
+            self._warm_up_done.set()
 
-        self.result_box_test.insert(tk.END, f"\n📊 Overall Metrics:\n")
-        self.result_box_test.insert(tk.END, f"Precision: {metrics['Precision']:.2f}\n")
-        self.result_box_test.insert(tk.END, f"Recall: {metrics['Recall']:.2f}\n")
-        self.result_box_test.insert(tk.END, f"F1-score: {metrics['F1-score']:.2f}\n")
+    def _poll_warm_up(self, thread: threading.Thread):
+        """Report the outcome of the model warm-up in the status bar"""
+        if thread.is_alive():
+            self.root.after(50, self._poll_warm_up, thread)
+        elif self.warm_up_error is None:
+            self.status_bar.configure(text="Ready")
+        else:
+            self.status_bar.configure(text="Model loading failed, see anonymizer.log")
 
     def run(self):
         """Start the GUI application"""
-        self.root.mainloop()
+        _log_listener.start()
+        self._start_warm_up()
+        try:
+            self.root.mainloop()
+        finally:
+            # Release a task still waiting on the warm-up, so the worker
+            # thread does not hold up exit
+            self._closing = True
+            self._warm_up_done.set()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            _log_listener.stop()
 
 
 if __name__ == "__main__":
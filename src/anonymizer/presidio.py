@@ -1,115 +1,102 @@
 from faker import Faker
-from typing import Dict, List, Any
-from sklearn.metrics import precision_score, recall_score, f1_score
+from typing import List
 import re
+from functools import lru_cache
 
-from presidio_analyzer import AnalyzerEngine
+from presidio_analyzer import AnalyzerEngine, RecognizerResult
 from presidio_anonymizer import AnonymizerEngine
 
-from .base import BaseAnonymizer, AnonymizationResult
-from .recognizers.us_bank_number import USBankNumberRecognizer
-from .recognizers.us_passport import USPassportRecognizer
-from .recognizers.medical_license import MedicalLicenseRecognizer
+from .base import BaseAnonymizer, AnonymizationResult, Entity
+from .presidio_engine import get_analyzer, get_anonymizer
+from .utils.nlp import may_contain_names
+from .utils.synthetic import fake_pii
+
+# Pulls the <LABEL> names out of Presidio-style labeled or anonymized text
+_LABEL_RE = re.compile(r"<([^>]+)>")
 
 
 class PresidioAnonymizer(BaseAnonymizer):
     """Presidio-based anonymizer implementation"""
 
+    label_pattern = _LABEL_RE
+
     def __init__(self):
-        self.analyzer = AnalyzerEngine()
-        self.anonymizer = AnonymizerEngine()
         self.faker = Faker()
 
-        # Add custom recognizers
-        self.analyzer.registry.add_recognizer(USBankNumberRecognizer())
-        self.analyzer.registry.add_recognizer(USPassportRecognizer())
-        self.analyzer.registry.add_recognizer(MedicalLicenseRecognizer())
+        # Cache results per instance; re-submitting the same text in the GUI
+        # then returns without another analyzer and anonymizer run
+        self._anonymize_cached = lru_cache(maxsize=1024)(self._anonymize)
+
+    @property
+    def analyzer(self) -> AnalyzerEngine:
+        """Shared Presidio analyzer, built on first use"""
+        return get_analyzer()
+
+    @property
+    def anonymizer(self) -> AnonymizerEngine:
+        """Shared Presidio anonymizer engine"""
+        return get_anonymizer()
 
     def anonymize_text(self, text: str) -> AnonymizationResult:
-        results = self.analyzer.analyze(text=text, language="en")
+        return self._anonymize_cached(text)
+
+    def _anonymize(self, text: str) -> AnonymizationResult:
+        nlp_artifacts = None
+        if not may_contain_names(text):
+            # NER cannot find a name or place here, so only the pattern
+            # recognizers need the parse
+            nlp_engine = self.analyzer.nlp_engine
+            nlp_artifacts = nlp_engine.process_text_without_ner(text, "en")
+        results = self.analyzer.analyze(
+            text=text,
+            language="en",
+            nlp_artifacts=nlp_artifacts,
+        )
+        return self._anonymize_results(text, results)
+
+    def anonymize_batch(self, texts: List[str]) -> List[AnonymizationResult]:
+        """Anonymize several texts, running spaCy over them as one batch"""
+        # The NLP engine picks the batch size and worker count itself, which
+        # BatchAnalyzerEngine.analyze_iterator overrides with 1 in newer
+        # Presidio releases
+        analyzer = self.analyzer
+        batch = analyzer.nlp_engine.process_batch(texts, language="en")
+        return [
+            self._anonymize_results(
+                text,
+                analyzer.analyze(text=text, language="en", nlp_artifacts=nlp_artifacts),
+            )
+            for text, (_, nlp_artifacts) in zip(texts, batch)
+        ]
+
+    def _anonymize_results(
+        self, text: str, results: List[RecognizerResult]
+    ) -> AnonymizationResult:
+        """Mask the analyzer results found in a text"""
         anonymized_result = self.anonymizer.anonymize(
             text=text, analyzer_results=results
         )
 
         # Convert Presidio results to our format
-        entities = []
-        for ent in results:
-            entities.append(
-                {"start": ent.start, "end": ent.end, "label": ent.entity_type}
-            )
+        entities = tuple(Entity(ent.start, ent.end, ent.entity_type) for ent in results)
 
         return AnonymizationResult(text=anonymized_result.text, entities=entities)
 
-    def evaluate_anonymization(
-        self, raw_text: str, labeled_text: str
-    ) -> Dict[str, float]:
-        anonymized = self.anonymize_text(raw_text)
-        expected_entities = re.findall(r"<(.*?)>", labeled_text)
-        anonymized_entities = re.findall(r"<(.*?)>", anonymized.text)
-
-        y_true, y_pred = [], []
-        for entity in expected_entities:
-            y_true.append(1)
-            y_pred.append(1 if entity in anonymized_entities else 0)
-        for entity in anonymized_entities:
-            if entity not in expected_entities:
-                y_true.append(0)
-                y_pred.append(1)
-
-        return {
-            "Precision": precision_score(y_true, y_pred, zero_division=0),
-            "Recall": recall_score(y_true, y_pred, zero_division=0),
-            "F1-score": f1_score(y_true, y_pred, zero_division=0),
-            "anonymized": anonymized.text,
-        }
-
     def generate_test_data(self, num_samples: int = 5) -> List[tuple]:
-        test_cases = []
-        for _ in range(num_samples):
-            name = self.faker.name()
-            email = self.faker.email()
-            phone = self.faker.phone_number()
-            clean_phone = phone.split(" x")[0]
-            location = self.faker.city()
-            ip = self.faker.ipv4()
-            credit_card = self.faker.credit_card_number()
-            bank_number = self.faker.random_int(min=10000000, max=99999999999999999)
-            passport = self.faker.random_int(min=100000000, max=999999999)
-            medical_license = f"{self.faker.random_uppercase_letter()}{self.faker.random_int(10000, 999999)}"
-            ssn = self.faker.ssn()
-
-            raw_text = (
-                f"Hello, I'm {name}. Contact me at {email} or call {clean_phone}. "
-                f"I'm from {location}. My IP is {ip}, my credit card is {credit_card}, "
-                f"my bank account is {bank_number}, my passport is {passport}, "
-                f"my medical license is {medical_license}, and my SSN is {ssn}."
-            )
-            expected_labeled = (
-                f"Hello, I'm <PERSON>. Contact me at <EMAIL_ADDRESS> or call <PHONE_NUMBER>. "
-                f"I'm from <LOCATION>. My IP is <IP_ADDRESS>, my credit card is <CREDIT_CARD>, "
-                f"my bank account is <US_BANK_NUMBER>, my passport is <US_PASSPORT>, "
-                f"my medical license is <MEDICAL_LICENSE>, and my SSN is <US_SSN>."
+        # The labeled text is the same for every sample
+        expected_labeled = (
+            "Hello, I'm <PERSON>. Contact me at <EMAIL_ADDRESS> or call <PHONE_NUMBER>. "
+            "I'm from <LOCATION>. My IP is <IP_ADDRESS>, my credit card is <CREDIT_CARD>, "
+            "my bank account is <US_BANK_NUMBER>, my passport is <US_PASSPORT>, "
+            "my medical license is <MEDICAL_LICENSE>, and my SSN is <US_SSN>."
+        )
+        return [
+            (
+                f"Hello, I'm {pii.name}. Contact me at {pii.email} or call {pii.phone}. "
+                f"I'm from {pii.city}. My IP is {pii.ip}, my credit card is {pii.credit_card}, "
+                f"my bank account is {pii.bank_number}, my passport is {pii.passport}, "
+                f"my medical license is {pii.medical_license}, and my SSN is {pii.ssn}.",
+                expected_labeled,
             )
-            test_cases.append((raw_text, expected_labeled))
-        return test_cases
-
-    def evaluate_test_cases(self, test_cases: List[tuple]) -> Dict[str, float]:
-        y_true, y_pred = [], []
-        for raw, expected in test_cases:
-            anonymized = self.anonymize_text(raw)
-            expected_entities = re.findall(r"<(.*?)>", expected)
-            anonymized_entities = re.findall(r"<(.*?)>", anonymized.text)
-
-            for entity in expected_entities:
-                y_true.append(1)
-                y_pred.append(1 if entity in anonymized_entities else 0)
-            for entity in anonymized_entities:
-                if entity not in expected_entities:
-                    y_true.append(0)
-                    y_pred.append(1)
-
-        return {
-            "Precision": precision_score(y_true, y_pred, zero_division=0),
-            "Recall": recall_score(y_true, y_pred, zero_division=0),
-            "F1-score": f1_score(y_true, y_pred, zero_division=0),
-        }
+            for pii in fake_pii(self.faker, num_samples)
+        ]
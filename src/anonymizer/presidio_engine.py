@@ -0,0 +1,85 @@
+"""Presidio engines shared by every PresidioAnonymizer."""
+
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from presidio_analyzer import AnalyzerEngine
+from presidio_analyzer.nlp_engine import NlpArtifacts, SpacyNlpEngine
+from presidio_anonymizer import AnonymizerEngine
+
+from .recognizers.combined_pattern import CombinedPatternRecognizer
+from .recognizers.us_bank_number import USBankNumberRecognizer
+from .recognizers.us_passport import USPassportRecognizer
+from .recognizers.medical_license import MedicalLicenseRecognizer
+from .utils.nlp import get_model_name, get_nlp, pipe_processes
+
+
+class SharedSpacyNlpEngine(SpacyNlpEngine):
+    """Presidio NLP engine that reuses the process-wide spaCy pipeline"""
+
+    def __init__(self):
+        super().__init__(models=[{"lang_code": "en", "model_name": get_model_name()}])
+
+    def load(self) -> None:
+        self.nlp = {"en": get_nlp()}
+
+    def process_text_without_ner(self, text: str, language: str) -> NlpArtifacts:
+        """Tokenize and lemmatize a text for context scoring, skipping NER"""
+        doc = self.nlp[language](text, disable=["ner"])
+        return self._doc_to_nlp_artifact(doc, language)
+
+    def process_batch(
+        self,
+        texts: Iterable[Union[str, Tuple[str, object]]],
+        language: str,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+        as_tuples: bool = False,
+    ) -> Iterator[tuple]:
+        """Pipe a batch through spaCy, across processes when it is large"""
+        # Sizes the caller leaves unset are chosen from the batch
+        if as_tuples:
+            texts = [(str(text), context) for text, context in texts]
+        else:
+            texts = [str(text) for text in texts]
+        if batch_size is None:
+            batch_size = 64
+        if n_process is None:
+            n_process = pipe_processes(len(texts))
+        outputs = self.nlp[language].pipe(
+            texts, as_tuples=as_tuples, batch_size=batch_size, n_process=n_process
+        )
+        for output in outputs:
+            if as_tuples:
+                doc, context = output
+                yield doc.text, self._doc_to_nlp_artifact(doc, language), context
+            else:
+                yield output.text, self._doc_to_nlp_artifact(output, language)
+
+
+@lru_cache(maxsize=None)
+def get_analyzer() -> AnalyzerEngine:
+    """Build the analyzer with the custom recognizers once per process"""
+    nlp_engine = SharedSpacyNlpEngine()
+    nlp_engine.load()
+    analyzer = AnalyzerEngine(nlp_engine=nlp_engine)
+
+    # Add custom recognizers, fused so their patterns take one scan; the
+    # passport recognizer relies on context words, which Presidio's context
+    # enhancer only applies to a recognizer registered on its own
+    analyzer.registry.add_recognizer(
+        CombinedPatternRecognizer(
+            [
+                USBankNumberRecognizer(),
+                MedicalLicenseRecognizer(),
+            ]
+        )
+    )
+    analyzer.registry.add_recognizer(USPassportRecognizer())
+    return analyzer
+
+
+@lru_cache(maxsize=None)
+def get_anonymizer() -> AnonymizerEngine:
+    """Build the anonymizer engine once per process"""
+    return AnonymizerEngine()
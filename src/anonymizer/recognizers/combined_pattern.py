@@ -0,0 +1,72 @@
+import re
+from typing import List, Optional
+
+from presidio_analyzer import EntityRecognizer, PatternRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+# The flags PatternRecognizer matches with by default
+REGEX_FLAGS = re.DOTALL | re.MULTILINE | re.IGNORECASE
+
+
+class CombinedPatternRecognizer(EntityRecognizer):
+    """Runs the patterns of several pattern recognizers as a single regex scan"""
+
+    def __init__(self, recognizers: List[PatternRecognizer]):
+        # Name every pattern so the alternation can report which one matched
+        self.group_patterns = {}
+        self.group_entities = {}
+        for recognizer in recognizers:
+            # Presidio's context enhancer scores results by the context words
+            # of the recognizer that produced them, which would be this one
+            if recognizer.context:
+                raise ValueError(
+                    f"{recognizer.name} uses context words, register it on its own"
+                )
+            for pattern in recognizer.patterns:
+                group = f"g{len(self.group_patterns)}"
+                self.group_patterns[group] = pattern
+                self.group_entities[group] = recognizer.supported_entities[0]
+
+        self.regex = re.compile(
+            "|".join(
+                f"(?P<{group}>{pattern.regex})"
+                for group, pattern in self.group_patterns.items()
+            ),
+            REGEX_FLAGS,
+        )
+        super().__init__(
+            supported_entities=list(dict.fromkeys(self.group_entities.values())),
+            name="CombinedPatternRecognizer",
+        )
+
+    def load(self) -> None:
+        pass
+
+    def analyze(
+        self,
+        text: str,
+        entities: List[str],
+        nlp_artifacts: Optional[NlpArtifacts] = None,
+    ) -> List[RecognizerResult]:
+        results = []
+        for match in self.regex.finditer(text):
+            entity = self.group_entities[match.lastgroup]
+            if entity not in entities:
+                continue
+            pattern = self.group_patterns[match.lastgroup]
+            explanation = PatternRecognizer.build_regex_explanation(
+                self.name, pattern.name, pattern.regex, pattern.score, None, REGEX_FLAGS
+            )
+            result = RecognizerResult(
+                entity_type=entity,
+                start=match.start(),
+                end=match.end(),
+                score=pattern.score,
+                analysis_explanation=explanation,
+                recognition_metadata={
+                    RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                    RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+                },
+            )
+            results.append(result)
+        return results
@@ -3,9 +3,12 @@ from presidio_analyzer import Pattern, PatternRecognizer
 
 class USPassportRecognizer(PatternRecognizer):
     def __init__(self):
-        patterns = [Pattern("US_PASSPORT", r"\b\d{9}\b", 0.5)]
+        # Scores below the bank number match of the same digits unless the
+        # context enhancer finds "passport" before it (0.2 + 0.35)
+        patterns = [Pattern("US_PASSPORT", r"\b\d{9}\b", 0.2)]
         super().__init__(
             supported_entity="US_PASSPORT",
             patterns=patterns,
             name="USPassportRecognizer",
+            context=["passport"],
         )
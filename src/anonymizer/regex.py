@@ -1,165 +1,279 @@
+import heapq
 import re
-import spacy
+from functools import lru_cache
 from faker import Faker
-from typing import Dict, List, Any
-from sklearn.metrics import precision_score, recall_score, f1_score
+from typing import List, Optional, Tuple
 
-from .base import BaseAnonymizer, AnonymizationResult
+from .base import BaseAnonymizer, AnonymizationResult, Entity
+from .utils.synthetic import fake_pii
+from .utils.nlp import LEMMA_PIPES, get_nlp, may_contain_names, pipe_processes
+
+# Patterns for structured PII, compiled once per process
+_REGEX_PATTERNS = {
+    "EMAIL": re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"),
+    "PHONE": re.compile(
+        r"\b(?:\+?\d{1,3}[-.\s]?)?(?:\(\d{3}\)|\d{3})[-.\s]?\d{3}[-.\s]?\d{4}(?:x\d+)?\b"
+    ),
+    "IP": re.compile(r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"),
+    "SSN": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
+    "GPS_COORDINATES": re.compile(r"\b-?\d{1,2}\.\d{5,},\s*-?\d{1,3}\.\d{5,}\b"),
+    "MEDICAL_LICENSE": re.compile(r"\b[A-Z]{1,2}\d{5,10}\b"),
+}
+
+# US Driver License patterns
+_US_DRIVER_LICENSE_PATTERNS = [
+    re.compile(r"\b[A-Z]{1}\d{7}\b"),  # e.g., NY, NJ
+    re.compile(r"\b[A-Z]{2}\d{6,8}\b"),  # e.g., FL, IL
+]
+
+# Candidate card, passport, bank and driver license numbers, told apart by
+# digit count, checksum and context once matched; only card-length runs may
+# be separated, and the plain digit runs inside them are candidates of their own
+_NUMBER_PATTERNS = [
+    re.compile(r"\b\d(?:[ -]?\d){12,15}\b"),
+    re.compile(r"\b\d{7,17}\b"),
+]
+
+# Extracts the entity labels from labeled or anonymized text
+_LABEL_RE = re.compile(r"\[([^\]]+)\]")
+
+# Cheap whole-text checks; a pattern is only scanned for when every
+# feature it needs is present in the text
+_TEXT_FEATURES = {
+    "at": lambda text: "@" in text,
+    "digit": re.compile(r"\d").search,
+    "upper": re.compile(r"[A-Z]").search,
+}
+
+# spaCy entity labels the NER pass masks, and the label each is reported as;
+# PII-specific models such as en_spacy_pii_fast tag places as LOCATION
+_NER_LABELS = {
+    "PERSON": "PERSON",
+    "GPE": "GPE",
+    "LOC": "LOC",
+    "LOCATION": "LOC",
+}
+
+# Replacement token for every label the regex and NER passes can produce
+_LABEL_TOKENS = {
+    label: f"[{label}]"
+    for label in (
+        "EMAIL",
+        "PHONE",
+        "IP",
+        "SSN",
+        "GPS_COORDINATES",
+        "MEDICAL_LICENSE",
+        "US_DRIVER_LICENSE",
+        "CREDIT_CARD",
+        "US_PASSPORT",
+        "US_BANK_NUMBER",
+        *_NER_LABELS.values(),
+    )
+}
+
+# Luhn doubling of each digit, with 9 already subtracted past 9
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+# Separators allowed between card number digit groups
+_SEPARATORS = str.maketrans("", "", " -")
+
+# How many characters around a numeric candidate are searched for the words
+# that make it a passport or driver license number
+_CONTEXT_CHARS = 30
+
+# Words that make a bare 7-digit run a driver license number, as in
+# "DL 1234567" or "1234567 CA license"
+_LICENSE_CONTEXT_RE = re.compile(r"licen[cs]e|driver|\bdl\b", re.IGNORECASE)
+
+
+def _span_order(span: Tuple[int, int, str]) -> Tuple[int, int]:
+    """Sort key placing earlier spans first and, among those, longer ones"""
+    return span[0], -span[1]
+
+
+def _luhn_valid(digits: str) -> bool:
+    """Check a string of digits against the Luhn checksum"""
+    total = sum(int(d) for d in digits[-1::-2])
+    total += sum(_LUHN_DOUBLED[int(d)] for d in digits[-2::-2])
+    return total % 10 == 0
+
+
+def _classify_number(candidate: str, prefix: str, suffix: str) -> Optional[str]:
+    """Label a numeric candidate given the text around it, or None to keep it"""
+    digits = candidate.translate(_SEPARATORS)
+    if len(digits) == 7:
+        # Too short for a bank number, and too common to mask without context
+        if _LICENSE_CONTEXT_RE.search(prefix) or _LICENSE_CONTEXT_RE.search(suffix):
+            return "US_DRIVER_LICENSE"
+        return None
+    if 13 <= len(digits) <= 16 and _luhn_valid(digits):
+        return "CREDIT_CARD"
+    if len(digits) == 9 and digits == candidate and "passport" in prefix.lower():
+        return "US_PASSPORT"
+    # Numbers that fail the checksum are still masked, just not as cards
+    return "US_BANK_NUMBER"
 
 
 class RegexAnonymizer(BaseAnonymizer):
     """Regex and NLP based anonymizer implementation"""
 
+    label_pattern = _LABEL_RE
+
     def __init__(self):
-        # Load NLP model and Faker
-        self.nlp = spacy.load("en_core_web_lg")
         self.faker = Faker()
 
-        # Precompile regex patterns
-        self.regex_patterns = {
-            "EMAIL": re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"),
-            "PHONE": re.compile(
-                r"\b(?:\+?\d{1,3}[-.\s]?)?(?:\(\d{3}\)|\d{3})[-.\s]?\d{3}[-.\s]?\d{4}(?:x\d+)?\b"
-            ),
-            "IP": re.compile(r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"),
-            "CREDIT_CARD": re.compile(r"\b(?:\d[ -]*?){13,16}\b"),
-            "SSN": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
-            "US_PASSPORT": re.compile(r"\b\d{9}\b"),
-            "GPS_COORDINATES": re.compile(
-                r"\b-?\d{1,2}\.\d{5,},\s*-?\d{1,3}\.\d{5,}\b"
-            ),
-            "MEDICAL_LICENSE": re.compile(r"\b[A-Z]{1,2}\d{5,10}\b"),
-            "US_BANK_NUMBER": re.compile(r"\b\d{8,17}\b"),
-        }
+        self.regex_patterns = _REGEX_PATTERNS
+        self.us_driver_license_patterns = _US_DRIVER_LICENSE_PATTERNS
+        self.number_patterns = _NUMBER_PATTERNS
 
-        # US Driver License patterns
-        self.us_driver_license_patterns = [
-            re.compile(r"\b[A-Z]{1}\d{7}\b"),  # e.g., NY, NJ
-            re.compile(r"\b\d{7,9}\b"),  # e.g., CA, TX
-            re.compile(r"\b[A-Z]{2}\d{6,8}\b"),  # e.g., FL, IL
+        # Every pattern with the label it reports; driver license patterns
+        # share a label, and numeric candidates are labeled once matched
+        self.labeled_patterns = [
+            (pattern, label) for label, pattern in self.regex_patterns.items()
         ]
+        self.labeled_patterns += [
+            (pattern, "US_DRIVER_LICENSE")
+            for pattern in self.us_driver_license_patterns
+        ]
+        self.labeled_patterns += [
+            (pattern, "NUMBER") for pattern in self.number_patterns
+        ]
+
+        # Text features each label's patterns need before they can match
+        self.label_requirements = {
+            label: frozenset({"digit"}) for _, label in self.labeled_patterns
+        }
+        self.label_requirements["EMAIL"] = frozenset({"at"})
+        for label in ("MEDICAL_LICENSE", "US_DRIVER_LICENSE"):
+            self.label_requirements[label] = frozenset({"digit", "upper"})
+
+        # Patterns worth scanning, per set of features present in a text
+        self.eligible_patterns = {}
+
+        # Memoize per instance so repeated GUI inputs skip the NLP pass
+        self._anonymize_cached = lru_cache(maxsize=1024)(self._anonymize)
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_nlp()
 
     def anonymize_text(self, text: str) -> AnonymizationResult:
-        matches = []  # Each match is a dict: {'start', 'end', 'label'}
+        return self._anonymize_cached(text)
 
-        # Collect structured PII using regex
-        for label, pattern in self.regex_patterns.items():
-            for match in pattern.finditer(text):
-                matches.append(
-                    {"start": match.start(), "end": match.end(), "label": label}
-                )
+    def _anonymize(self, text: str) -> AnonymizationResult:
+        doc = self.nlp(text, disable=LEMMA_PIPES) if may_contain_names(text) else None
+        return self._anonymize_doc(text, doc)
+
+    def anonymize_batch(self, texts: List[str]) -> List[AnonymizationResult]:
+        """Anonymize several texts, running spaCy over them as one batch"""
+        needs_nlp = [may_contain_names(text) for text in texts]
+        nlp_texts = [text for text, needed in zip(texts, needs_nlp) if needed]
+        docs = self.nlp.pipe(
+            nlp_texts,
+            batch_size=64,
+            n_process=pipe_processes(len(nlp_texts)),
+            disable=LEMMA_PIPES,
+        )
+        return [
+            self._anonymize_doc(text, next(docs) if needed else None)
+            for text, needed in zip(texts, needs_nlp)
+        ]
+
+    def _patterns_for(self, text: str) -> List[Tuple[re.Pattern, str]]:
+        """Select the patterns that can match the text, given its features"""
+        features = frozenset(
+            name for name, check in _TEXT_FEATURES.items() if check(text)
+        )
+        if features not in self.eligible_patterns:
+            self.eligible_patterns[features] = [
+                (pattern, label)
+                for pattern, label in self.labeled_patterns
+                if self.label_requirements[label] <= features
+            ]
+        return self.eligible_patterns[features]
 
-        # Collect US driver licenses
-        for pattern in self.us_driver_license_patterns:
+    def _collect_regex_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """Collect structured PII, one pass per pattern that can match"""
+        matches = []  # Each match is a (start, end, label) tuple
+        append = matches.append
+        for pattern, label in self._patterns_for(text):
             for match in pattern.finditer(text):
-                matches.append(
-                    {
-                        "start": match.start(),
-                        "end": match.end(),
-                        "label": "US_DRIVER_LICENSE",
-                    }
-                )
-
-        # Use NLP for entity recognition
-        doc = self.nlp(text)
+                start, end = match.span()
+                match_label = label
+                if label == "NUMBER":
+                    match_label = _classify_number(
+                        match.group(),
+                        text[max(0, start - _CONTEXT_CHARS) : start],
+                        text[end : end + _CONTEXT_CHARS],
+                    )
+                    if match_label is None:
+                        continue
+                append((start, end, match_label))
+
+        # Patterns may overlap, so order by start and then longest first;
+        # the sort is stable, so equal spans keep the pattern order
+        matches.sort(key=_span_order)
+        return matches
+
+    def _collect_nlp_matches(self, doc) -> List[Tuple[int, int, str]]:
+        """Collect unstructured PII from the entities of a spaCy doc"""
+        matches = []
+        if doc is None:
+            return matches
+        append = matches.append
         for ent in doc.ents:
-            if ent.label_ in ["PERSON", "GPE", "LOC"]:
-                matches.append(
-                    {"start": ent.start_char, "end": ent.end_char, "label": ent.label_}
-                )
+            label = _NER_LABELS.get(ent.label_)
+            if label is not None:
+                append((ent.start_char, ent.end_char, label))
+        return matches
 
-        # Sort matches by starting index
-        matches.sort(key=lambda m: (m["start"], -m["end"]))
+    def _anonymize_doc(self, text: str, doc) -> AnonymizationResult:
+        """Mask the regex and NER matches of a text, given its parsed doc if any"""
+        # Regex and NER matches both arrive ordered by start, so merge the
+        # two streams instead of sorting their concatenation
+        matches = heapq.merge(
+            self._collect_regex_matches(text),
+            self._collect_nlp_matches(doc),
+            key=_span_order,
+        )
 
         # Filter out overlapping spans
         filtered = []
         current_end = 0
-        for m in matches:
-            if m["start"] >= current_end:
-                filtered.append(m)
-                current_end = m["end"]
+        for start, end, label in matches:
+            if start >= current_end:
+                filtered.append((start, end, label))
+                current_end = end
 
         # Reconstruct the anonymized text
-        anonymized_text = ""
+        parts = []
         last_index = 0
-        for m in filtered:
-            anonymized_text += text[last_index : m["start"]]
-            anonymized_text += f"[{m['label']}]"
-            last_index = m["end"]
-        anonymized_text += text[last_index:]
-
-        return AnonymizationResult(text=anonymized_text, entities=filtered)
-
-    def evaluate_anonymization(
-        self, raw_text: str, labeled_text: str
-    ) -> Dict[str, float]:
-        anonymized = self.anonymize_text(raw_text)
-        expected_entities = re.findall(r"\[(.*?)\]", labeled_text)
-        anonymized_entities = re.findall(r"\[(.*?)\]", anonymized.text)
-
-        y_true, y_pred = [], []
-        for entity in expected_entities:
-            y_true.append(1)
-            y_pred.append(1 if entity in anonymized_entities else 0)
-        for entity in anonymized_entities:
-            if entity not in expected_entities:
-                y_true.append(0)
-                y_pred.append(1)
-
-        return {
-            "Precision": precision_score(y_true, y_pred, zero_division=0),
-            "Recall": recall_score(y_true, y_pred, zero_division=0),
-            "F1-score": f1_score(y_true, y_pred, zero_division=0),
-            "anonymized": anonymized.text,
-        }
+        for start, end, label in filtered:
+            parts.append(text[last_index:start])
+            parts.append(_LABEL_TOKENS[label])
+            last_index = end
+        parts.append(text[last_index:])
+
+        entities = tuple(Entity(start, end, label) for start, end, label in filtered)
+        return AnonymizationResult(text="".join(parts), entities=entities)
 
     def generate_test_data(self, num_samples: int = 5) -> List[tuple]:
-        test_cases = []
-        for _ in range(num_samples):
-            name = self.faker.name()
-            email = self.faker.email()
-            phone = self.faker.phone_number()
-            clean_phone = phone.split(" x")[0]
-            ip = self.faker.ipv4()
-            credit_card = self.faker.credit_card_number()
-            ssn = self.faker.ssn()
-            bank_number = self.faker.random_int(min=10000000, max=99999999999999999)
-            passport = self.faker.random_int(min=100000000, max=999999999)
-            latitude, longitude = self.faker.latitude(), self.faker.longitude()
-            medical_license = f"{self.faker.random_uppercase_letter()}{self.faker.random_int(10000, 999999)}"
-
-            raw_text = (
-                f"Hello, I'm {name}. Contact me at {email} or call {clean_phone}. "
-                f"My IP is {ip}, and my credit card is {credit_card}. "
-                f"SSN: {ssn}, Bank: {bank_number}, Passport: {passport}, "
-                f"GPS: {latitude}, {longitude}, Medical License: {medical_license}."
-            )
-            expected_labeled = (
-                f"Hello, I'm [PERSON]. Contact me at [EMAIL] or call [PHONE]. "
-                f"My IP is [IP], and my credit card is [CREDIT_CARD]. "
-                f"SSN: [SSN], Bank: [US_BANK_NUMBER], Passport: [US_PASSPORT], "
-                f"GPS: [GPS_COORDINATES], Medical License: [MEDICAL_LICENSE]."
+        # The labeled text is the same for every sample
+        expected_labeled = (
+            "Hello, I'm [PERSON]. Contact me at [EMAIL] or call [PHONE]. "
+            "My IP is [IP], and my credit card is [CREDIT_CARD]. "
+            "SSN: [SSN], Bank: [US_BANK_NUMBER], Passport: [US_PASSPORT], "
+            "GPS: [GPS_COORDINATES], Medical License: [MEDICAL_LICENSE]."
+        )
+        return [
+            (
+                f"Hello, I'm {pii.name}. Contact me at {pii.email} or call {pii.phone}. "
+                f"My IP is {pii.ip}, and my credit card is {pii.credit_card}. "
+                f"SSN: {pii.ssn}, Bank: {pii.bank_number}, Passport: {pii.passport}, "
+                f"GPS: {pii.latitude}, {pii.longitude}, Medical License: {pii.medical_license}.",
+                expected_labeled,
             )
-            test_cases.append((raw_text, expected_labeled))
-        return test_cases
-
-    def evaluate_test_cases(self, test_cases: List[tuple]) -> Dict[str, float]:
-        y_true, y_pred = [], []
-        for raw, expected in test_cases:
-            anonymized = self.anonymize_text(raw)
-            expected_entities = re.findall(r"\[(.*?)\]", expected)
-            anonymized_entities = re.findall(r"\[(.*?)\]", anonymized.text)
-
-            for entity in expected_entities:
-                y_true.append(1)
-                y_pred.append(1 if entity in anonymized_entities else 0)
-            for entity in anonymized_entities:
-                if entity not in expected_entities:
-                    y_true.append(0)
-                    y_pred.append(1)
-
-        return {
-            "Precision": precision_score(y_true, y_pred, zero_division=0),
-            "Recall": recall_score(y_true, y_pred, zero_division=0),
-            "F1-score": f1_score(y_true, y_pred, zero_division=0),
-        }
+            for pii in fake_pii(self.faker, num_samples)
+        ]
@@ -0,0 +1,37 @@
+"""Entity-level evaluation metrics."""
+
+from collections import Counter
+from typing import Dict, List, Pattern, Tuple
+
+
+def count_entities(expected: List[str], anonymized: List[str]) -> Tuple[int, int, int]:
+    """Count true positives, false positives and false negatives of two label lists"""
+    expected_counts = Counter(expected)
+    anonymized_counts = Counter(anonymized)
+    tp = sum((expected_counts & anonymized_counts).values())
+    fp = sum((anonymized_counts - expected_counts).values())
+    fn = sum((expected_counts - anonymized_counts).values())
+    return tp, fp, fn
+
+
+def compute_metrics(tp: int, fp: int, fn: int) -> Dict[str, float]:
+    """Compute precision, recall and F1-score, using 0.0 where undefined"""
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"Precision": precision, "Recall": recall, "F1-score": f1}
+
+
+def score_labels(
+    label_pattern: Pattern[str], expected: List[str], anonymized: List[str]
+) -> Dict[str, float]:
+    """Score anonymized texts against the expected ones by the labels they contain"""
+    tp = fp = fn = 0
+    for expected_text, anonymized_text in zip(expected, anonymized):
+        case_tp, case_fp, case_fn = count_entities(
+            label_pattern.findall(expected_text), label_pattern.findall(anonymized_text)
+        )
+        tp += case_tp
+        fp += case_fp
+        fn += case_fn
+    return compute_metrics(tp, fp, fn)
@@ -0,0 +1,68 @@
+"""spaCy setup shared by the anonymizers."""
+
+import os
+import re
+from functools import lru_cache
+
+import spacy
+
+DEFAULT_MODEL = "en_core_web_lg"
+
+# Components neither anonymizer reads
+UNUSED_PIPES = ["parser", "senter"]
+
+# Components only Presidio reads, for the lemmas its context enhancer matches
+# on; the regex anonymizer only reads doc.ents and skips them per call
+LEMMA_PIPES = ["tagger", "attribute_ruler", "lemmatizer"]
+
+# Below this many texts, starting worker processes costs more than it saves
+PARALLEL_MIN_TEXTS = 256
+
+# Names and places can be written in any script and in any case, so only
+# text without a single letter is known to hold no PERSON/GPE/LOC entities
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+
+@lru_cache(maxsize=None)
+def setup_device() -> bool:
+    """Run spaCy on the GPU when one is available, unless ANONYMIZER_DEVICE=cpu"""
+    if os.environ.get("ANONYMIZER_DEVICE", "auto") == "cpu":
+        return False
+    try:
+        import cupy  # noqa: F401
+
+        return spacy.require_gpu()
+    except Exception:
+        return spacy.prefer_gpu()
+
+
+def get_model_name() -> str:
+    """Name of the spaCy model to load, overridable via ANONYMIZER_SPACY_MODEL"""
+    return os.environ.get("ANONYMIZER_SPACY_MODEL", DEFAULT_MODEL)
+
+
+@lru_cache(maxsize=None)
+def get_nlp():
+    """Load the spaCy pipeline once per process and share it"""
+    setup_device()
+    return spacy.load(get_model_name(), disable=UNUSED_PIPES)
+
+
+def warm_up_gpu() -> None:
+    """Materialize the CUDA context now rather than on the first request"""
+    if setup_device():
+        import cupy
+
+        cupy.empty((1,))
+
+
+def pipe_processes(num_texts: int) -> int:
+    """Number of worker processes nlp.pipe should use for a batch of texts"""
+    if setup_device() or num_texts < PARALLEL_MIN_TEXTS:
+        return 1
+    return min(8, os.cpu_count() or 1)
+
+
+def may_contain_names(text: str) -> bool:
+    """Cheap check for whether running NER on the text can find anything"""
+    return _LETTER_RE.search(text) is not None
@@ -0,0 +1,57 @@
+"""Fake PII values for the synthetic test cases."""
+
+from string import ascii_uppercase
+from typing import List, NamedTuple
+
+from faker import Faker
+
+
+class FakePII(NamedTuple):
+    """One test sample's worth of fake PII"""
+
+    name: str
+    email: str
+    phone: str
+    city: str
+    ip: str
+    credit_card: str
+    ssn: str
+    bank_number: int
+    passport: int
+    latitude: str
+    longitude: str
+    medical_license: str
+
+
+def fake_pii(faker: Faker, num_samples: int) -> List[FakePII]:
+    """Draw the fake PII of several test samples, one field at a time"""
+    rng = faker.random
+    samples = range(num_samples)
+
+    def draw(provider):
+        # Faker resolves every attribute through its proxy, so each provider
+        # is looked up once per field rather than once per sample
+        return [provider() for _ in samples]
+
+    # The plain numeric fields come straight from Faker's RNG, so
+    # Faker.seed() still applies to them
+    return list(
+        map(
+            FakePII,
+            draw(faker.name),
+            draw(faker.email),
+            [phone.split(" x")[0] for phone in draw(faker.phone_number)],
+            draw(faker.city),
+            draw(faker.ipv4),
+            draw(faker.credit_card_number),
+            draw(faker.ssn),
+            [rng.randint(10000000, 99999999999999999) for _ in samples],
+            [rng.randint(100000000, 999999999) for _ in samples],
+            [f"{rng.uniform(-90, 90):.6f}" for _ in samples],
+            [f"{rng.uniform(-180, 180):.6f}" for _ in samples],
+            [
+                f"{rng.choice(ascii_uppercase)}{rng.randint(10000, 999999)}"
+                for _ in samples
+            ],
+        )
+    )
@@ -0,0 +1,46 @@
+import re
+import unittest
+
+from src.anonymizer.base import AnonymizationResult, BaseAnonymizer, Entity
+
+
+class AliceAnonymizer(BaseAnonymizer):
+    """Masks the word "Alice" and nothing else"""
+
+    label_pattern = re.compile(r"\[([^\]]+)\]")
+
+    def anonymize_text(self, text):
+        start = text.find("Alice")
+        if start < 0:
+            return AnonymizationResult(text=text, entities=())
+        return AnonymizationResult(
+            text=text.replace("Alice", "[PERSON]", 1),
+            entities=(Entity(start, start + 5, "PERSON"),),
+        )
+
+    def generate_test_data(self, num_samples=5):
+        return [("Hi Alice", "Hi [PERSON]")] * num_samples
+
+
+class BaseAnonymizerTest(unittest.TestCase):
+    def setUp(self):
+        self.anonymizer = AliceAnonymizer()
+
+    def test_evaluate_anonymization(self):
+        metrics = self.anonymizer.evaluate_anonymization(
+            "Alice and Bob", "[PERSON] and [PERSON]"
+        )
+        self.assertEqual(metrics["anonymized"], "[PERSON] and Bob")
+        self.assertEqual(metrics["Precision"], 1.0)
+        self.assertEqual(metrics["Recall"], 0.5)
+
+    def test_evaluate_test_cases(self):
+        test_cases = [("Hi Alice", "Hi [PERSON]"), ("Hi Bob", "Hi [PERSON]")]
+        metrics = self.anonymizer.evaluate_test_cases(test_cases)
+        self.assertEqual(metrics["anonymized"], ["Hi [PERSON]", "Hi Bob"])
+        self.assertEqual(metrics["Precision"], 1.0)
+        self.assertEqual(metrics["Recall"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import re
+
+from src.anonymizer.utils.metrics import compute_metrics, count_entities, score_labels
+
+
+class CountEntitiesTest(unittest.TestCase):
+    def test_matching_labels(self):
+        self.assertEqual(
+            count_entities(["PERSON", "EMAIL"], ["EMAIL", "PERSON"]), (2, 0, 0)
+        )
+
+    def test_repeated_labels_count_per_occurrence(self):
+        expected = ["PERSON", "PERSON", "EMAIL"]
+        anonymized = ["PERSON", "EMAIL", "EMAIL", "IP"]
+        self.assertEqual(count_entities(expected, anonymized), (2, 2, 1))
+
+    def test_empty_lists(self):
+        self.assertEqual(count_entities([], []), (0, 0, 0))
+
+
+class ComputeMetricsTest(unittest.TestCase):
+    def test_scores(self):
+        metrics = compute_metrics(tp=2, fp=2, fn=1)
+        self.assertAlmostEqual(metrics["Precision"], 0.5)
+        self.assertAlmostEqual(metrics["Recall"], 2 / 3)
+        self.assertAlmostEqual(metrics["F1-score"], 4 / 7)
+
+    def test_undefined_scores_are_zero(self):
+        self.assertEqual(
+            compute_metrics(0, 0, 0),
+            {"Precision": 0.0, "Recall": 0.0, "F1-score": 0.0},
+        )
+
+    def test_no_true_positives(self):
+        metrics = compute_metrics(tp=0, fp=3, fn=2)
+        self.assertEqual(metrics["F1-score"], 0.0)
+
+
+class ScoreLabelsTest(unittest.TestCase):
+    def test_counts_are_summed_over_texts(self):
+        label_re = re.compile(r"\[([^\]]+)\]")
+        expected = ["Hi [PERSON], mail [EMAIL]", "IP [IP]"]
+        anonymized = ["Hi [PERSON], mail [PHONE]", "IP [IP] [SSN]"]
+        metrics = score_labels(label_re, expected, anonymized)
+        self.assertEqual(metrics, compute_metrics(tp=2, fp=2, fn=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,16 @@
+import unittest
+
+from src.anonymizer.utils.nlp import may_contain_names
+
+
+class MayContainNamesTest(unittest.TestCase):
+    def test_names_in_any_case_or_script(self):
+        for text in ["John Smith", "JOHN SMITH", "john smith", "Émile", "Łukasz"]:
+            self.assertTrue(may_contain_names(text), text)
+
+    def test_text_without_letters(self):
+        self.assertFalse(may_contain_names("555-123-4567, 10.0.0.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+
+import spacy
+from presidio_analyzer import AnalyzerEngine, Pattern, PatternRecognizer
+from presidio_analyzer import RecognizerRegistry
+from spacy.language import Language
+
+from src.anonymizer.presidio_engine import SharedSpacyNlpEngine
+from src.anonymizer.recognizers.combined_pattern import CombinedPatternRecognizer
+from src.anonymizer.recognizers.medical_license import MedicalLicenseRecognizer
+from src.anonymizer.recognizers.us_bank_number import USBankNumberRecognizer
+from src.anonymizer.recognizers.us_passport import USPassportRecognizer
+
+
+@Language.component("test_lowercase_lemmas")
+def _lowercase_lemmas(doc):
+    """Stand in for a lemmatizer, which a blank pipeline lacks"""
+    for token in doc:
+        token.lemma_ = token.lower_
+    return doc
+
+
+def _blank_nlp_engine() -> SharedSpacyNlpEngine:
+    nlp = spacy.blank("en")
+    nlp.add_pipe("test_lowercase_lemmas")
+    nlp_engine = SharedSpacyNlpEngine()
+    nlp_engine.nlp = {"en": nlp}
+    return nlp_engine
+
+
+class CombinedPatternRecognizerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.recognizer = CombinedPatternRecognizer(
+            [USBankNumberRecognizer(), MedicalLicenseRecognizer()]
+        )
+        cls.entities = cls.recognizer.supported_entities
+
+    def test_matches_map_back_to_their_entity(self):
+        text = "Bank 12345678, license AB123456"
+        results = self.recognizer.analyze(text, self.entities)
+        self.assertEqual(
+            [(r.entity_type, text[r.start : r.end]) for r in results],
+            [("US_BANK_NUMBER", "12345678"), ("MEDICAL_LICENSE", "AB123456")],
+        )
+        for result in results:
+            self.assertEqual(result.score, 0.5)
+            self.assertEqual(
+                result.recognition_metadata[result.RECOGNIZER_IDENTIFIER_KEY],
+                self.recognizer.id,
+            )
+
+    def test_only_requested_entities(self):
+        text = "Bank 12345678, license AB123456"
+        results = self.recognizer.analyze(text, ["MEDICAL_LICENSE"])
+        self.assertEqual([r.entity_type for r in results], ["MEDICAL_LICENSE"])
+
+    def test_recognizer_without_context(self):
+        recognizer = PatternRecognizer(
+            supported_entity="TICKET",
+            patterns=[Pattern("TICKET", r"\bT-\d{4}\b", 0.6)],
+        )
+        self.assertIsNone(recognizer.context)
+        combined = CombinedPatternRecognizer([recognizer])
+        results = combined.analyze("see T-1234", ["TICKET"])
+        self.assertEqual([(r.start, r.end) for r in results], [(4, 10)])
+
+    def test_recognizer_with_context_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CombinedPatternRecognizer([USPassportRecognizer()])
+
+
+class PassportContextTest(unittest.TestCase):
+    """Passport numbers are told from bank numbers by Presidio's context enhancer"""
+
+    @classmethod
+    def setUpClass(cls):
+        registry = RecognizerRegistry(
+            recognizers=[
+                CombinedPatternRecognizer(
+                    [USBankNumberRecognizer(), MedicalLicenseRecognizer()]
+                ),
+                USPassportRecognizer(),
+            ]
+        )
+        cls.analyzer = AnalyzerEngine(registry=registry, nlp_engine=_blank_nlp_engine())
+
+    def scores(self, text, **kwargs):
+        results = self.analyzer.analyze(text=text, language="en", **kwargs)
+        return {r.entity_type: r.score for r in results}
+
+    def test_bare_number_scores_as_bank_number(self):
+        scores = self.scores("Bank: 123456789")
+        self.assertGreater(scores["US_BANK_NUMBER"], scores["US_PASSPORT"])
+
+    def test_passport_context_boosts_passport(self):
+        scores = self.scores("my passport is 123456789")
+        self.assertGreater(scores["US_PASSPORT"], scores["US_BANK_NUMBER"])
+
+    def test_context_passed_to_analyze(self):
+        scores = self.scores("Number: 123456789", context=["passport"])
+        self.assertGreater(scores["US_PASSPORT"], scores["US_BANK_NUMBER"])
+
+
+class SharedSpacyNlpEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.nlp_engine = _blank_nlp_engine()
+
+    def test_process_batch(self):
+        texts = ["Call John", "Bank 12345678"]
+        batch = list(self.nlp_engine.process_batch(texts, language="en"))
+        self.assertEqual([text for text, _ in batch], texts)
+        self.assertEqual(
+            [artifacts.lemmas for _, artifacts in batch],
+            [["call", "john"], ["bank", "12345678"]],
+        )
+
+    def test_process_batch_as_tuples(self):
+        texts = [("Call John", {"id": 1}), ("Bank 12345678", {"id": 2})]
+        batch = list(
+            self.nlp_engine.process_batch(
+                texts, language="en", batch_size=1, n_process=1, as_tuples=True
+            )
+        )
+        self.assertEqual(
+            [(text, context) for text, _, context in batch],
+            [("Call John", {"id": 1}), ("Bank 12345678", {"id": 2})],
+        )
+        self.assertEqual(batch[1][1].tokens.text, "Bank 12345678")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from src.anonymizer.base import Entity
+from src.anonymizer.regex import RegexAnonymizer, _classify_number, _luhn_valid
+
+
+class LuhnTest(unittest.TestCase):
+    def test_valid_numbers(self):
+        self.assertTrue(_luhn_valid("4111111111111111"))
+        self.assertTrue(_luhn_valid("378282246310005"))
+
+    def test_invalid_number(self):
+        self.assertFalse(_luhn_valid("4111111111111112"))
+
+
+class ClassifyNumberTest(unittest.TestCase):
+    def test_card_numbers(self):
+        self.assertEqual(_classify_number("4111111111111111", "", ""), "CREDIT_CARD")
+        self.assertEqual(_classify_number("4111 1111 1111 1111", "", ""), "CREDIT_CARD")
+        self.assertEqual(_classify_number("4111-1111-1111-1111", "", ""), "CREDIT_CARD")
+
+    def test_unseparated_non_luhn_run_is_bank_number(self):
+        self.assertEqual(_classify_number("4111111111111112", "", ""), "US_BANK_NUMBER")
+
+    def test_separated_non_luhn_run_is_bank_number(self):
+        self.assertEqual(
+            _classify_number("4111-1111-1111-1112", "", ""), "US_BANK_NUMBER"
+        )
+        self.assertEqual(_classify_number("12345678 12345", "", ""), "US_BANK_NUMBER")
+
+    def test_passport_needs_context(self):
+        self.assertEqual(
+            _classify_number("123456789", "my passport is ", ""), "US_PASSPORT"
+        )
+        self.assertEqual(_classify_number("123456789", "Bank: ", ""), "US_BANK_NUMBER")
+
+    def test_seven_digit_run_needs_license_context(self):
+        self.assertEqual(_classify_number("1234567", "DL ", ""), "US_DRIVER_LICENSE")
+        self.assertEqual(
+            _classify_number("1234567", "acct ", " CA license"), "US_DRIVER_LICENSE"
+        )
+        self.assertIsNone(_classify_number("1234567", "order ", " shipped"))
+
+    def test_bank_numbers(self):
+        self.assertEqual(_classify_number("12345678", "", ""), "US_BANK_NUMBER")
+        self.assertEqual(
+            _classify_number("12345678901234567", "passport ", ""), "US_BANK_NUMBER"
+        )
+
+
+class RegexMaskingTest(unittest.TestCase):
+    """Structured PII masking, without the NER pass"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.anonymizer = RegexAnonymizer()
+
+    def assertMasked(self, text, expected):
+        self.assertEqual(self.anonymizer._anonymize_doc(text, None).text, expected)
+
+    def test_separated_non_luhn_runs_are_masked(self):
+        self.assertMasked("Bank: 12345678 12345", "Bank: [US_BANK_NUMBER]")
+        self.assertMasked("1234 5678 9012 3456", "[US_BANK_NUMBER]")
+        self.assertMasked("4111-1111-1111-1112", "[US_BANK_NUMBER]")
+
+    def test_separated_card_number(self):
+        self.assertMasked("card 4111 1111 1111 1111", "card [CREDIT_CARD]")
+
+    def test_digit_run_inside_rejected_separated_run(self):
+        # The separated run starting inside the IP must not hide the
+        # bank number after it
+        self.assertMasked("IP 1.2.3.45 12345678901234", "IP [IP] [US_BANK_NUMBER]")
+
+    def test_longest_match_wins_over_phone(self):
+        self.assertMasked("acct 1234567890 1234", "acct [US_BANK_NUMBER]")
+        self.assertMasked("555-123-4567-1234-5", "[US_BANK_NUMBER]")
+
+    def test_phone_wins_over_equally_long_number(self):
+        self.assertMasked("call 5551234567", "call [PHONE]")
+
+    def test_result_is_hashable(self):
+        result = self.anonymizer._anonymize_doc("call 555-123-4567", None)
+        self.assertEqual(result.entities, (Entity(5, 17, "PHONE"),))
+        self.assertEqual(hash(result), hash(result))
+
+    def test_driver_license_context(self):
+        self.assertMasked(
+            "acct 1234567 CA license", "acct [US_DRIVER_LICENSE] CA license"
+        )
+        self.assertMasked("order 1234567 shipped", "order 1234567 shipped")
+
+    def test_passport_context(self):
+        self.assertMasked("Passport: 123456789", "Passport: [US_PASSPORT]")
+        self.assertMasked("Bank: 123456789", "Bank: [US_BANK_NUMBER]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from faker import Faker
+
+from src.anonymizer.utils.synthetic import fake_pii
+
+
+class FakePIITest(unittest.TestCase):
+    def test_one_record_per_sample(self):
+        records = fake_pii(Faker(), 3)
+        self.assertEqual(len(records), 3)
+        for record in records:
+            self.assertEqual(len(str(record.passport)), 9)
+            self.assertRegex(record.medical_license, r"^[A-Z]\d{5,6}$")
+
+    def test_seed_applies_to_every_field(self):
+        Faker.seed(7)
+        first = fake_pii(Faker(), 2)
+        Faker.seed(7)
+        self.assertEqual(fake_pii(Faker(), 2), first)
+
+
+if __name__ == "__main__":
+    unittest.main()